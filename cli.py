@@ -7,18 +7,48 @@ Command-line interface for managing tasks and testing the system.
 
 import os
 import sys
-import json
-import asyncio
-import base64
-from datetime import datetime, timedelta
-from pathlib import Path
-import argparse
-
-# Add the current directory to Python path
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import functools
+
+_STATUS_EMOJI = {
+    "pending": "⏳",
+    "active": "🔥",
+    "completed": "✅",
+    "failed": "❌"
+}
+
+_TASK_TEMPLATE = (
+    "{emoji} Task {id}: {task_name}\n"
+    "   ⏰ Time: {start_time} ({task_duration} min)\n"
+    "   📋 Instructions: {verification_instructions}...\n"
+    "   📊 Status: {status}\n"
+    "\n"
+)
+
+_COMMANDS = {
+    "status": "Check system status",
+    "list": "List all scheduled tasks",
+    "create-test": "Create a test task",
+    "verify": "Simulate verification",
+    "verify-batch": "Simulate verification for many tasks",
+    "server": "Start the web server (--reload to restart on code changes)",
+}
+
+_USAGE = f"usage: cli.py {{{','.join(_COMMANDS)}}} ..."
+
+_EXAMPLES = """
+Examples:
+  python cli.py status              # Check system status
+  python cli.py list               # List all tasks  
+  python cli.py create-test        # Create a test task
+  python cli.py verify 1           # Simulate verification for task 1
+  python cli.py verify-batch ids.json  # Simulate verification for a list of tasks
+  python cli.py server             # Start the web server
+  python cli.py server --reload    # Start the web server with auto-reload
+        """
 
+@functools.lru_cache(maxsize=1)
 def load_environment():
-    """Load environment variables"""
+    """Load environment variables (parsed once per process)"""
     try:
         from dotenv import load_dotenv
         load_dotenv()
@@ -27,12 +57,20 @@ def load_environment():
         print("❌ python-dotenv not installed")
         return False
 
+@functools.lru_cache(maxsize=1)
+def _get_db(path: str):
+    """Return a shared DatabaseManager so its connection is opened only once"""
+    from main import DatabaseManager
+
+    return DatabaseManager(path)
+
 def create_test_task():
     """Create a test task for demonstration"""
     try:
-        from main import DatabaseManager, ScheduleTask
+        from datetime import datetime, timedelta
+        from main import ScheduleTask
 
-        db = DatabaseManager("schedule_enforcer.db")
+        db = _get_db("schedule_enforcer.db")
 
         # Create a task for 2 minutes from now
         future_time = (datetime.now() + timedelta(minutes=2)).strftime("%H:%M")
@@ -59,72 +97,83 @@ def create_test_task():
 def list_tasks():
     """List all scheduled tasks"""
     try:
-        from main import DatabaseManager
-
-        db = DatabaseManager("schedule_enforcer.db")
-        tasks = db.get_all_tasks()
-
-        if not tasks:
-            print("📝 No scheduled tasks found")
-            return
+        db = _get_db("schedule_enforcer.db")
 
-        print("\n📋 Scheduled Tasks:")
-        print("-" * 60)
+        # Rows are streamed from the cursor; the header is written with the first one
+        header = "\n📋 Scheduled Tasks:\n" + "-" * 60 + "\n"
+        found = False
 
-        for task in tasks:
-            status_emoji = {
-                "pending": "⏳",
-                "active": "🔥", 
-                "completed": "✅",
-                "failed": "❌"
-            }.get(task["status"], "❓")
+        for task in db.iter_tasks():
+            sys.stdout.write(
+                ("" if found else header) +
+                _TASK_TEMPLATE.format(emoji=_STATUS_EMOJI.get(task["status"], "❓"), **task)
+            )
+            found = True
 
-            print(f"{status_emoji} Task {task['id']}: {task['task_name']}")
-            print(f"   ⏰ Time: {task['start_time']} ({task['task_duration']} min)")
-            print(f"   📋 Instructions: {task['verification_instructions'][:50]}...")
-            print(f"   📊 Status: {task['status']}")
-            print()
+        if not found:
+            print("📝 No scheduled tasks found")
 
     except Exception as e:
         print(f"❌ Error listing tasks: {e}")
 
+@functools.lru_cache(maxsize=1)
+def _groq_configured():
+    """Report whether a Groq API key is available"""
+    return bool(os.getenv("GROQ_API_KEY"))
+
 def check_system_status():
     """Check system status"""
     try:
-        from main import DatabaseManager
+        from datetime import datetime
 
-        db = DatabaseManager("schedule_enforcer.db")
-        tasks = db.get_all_tasks()
+        db = _get_db("schedule_enforcer.db")
         current_time = datetime.now().strftime("%H:%M")
-
-        active_tasks = [t for t in tasks if t["status"] == "active"]
-        completed_tasks = [t for t in tasks if t["status"] == "completed"]
-        pending_tasks = [t for t in tasks if t["status"] == "pending"]
-
-        print("\n📊 System Status")
-        print("-" * 30)
-        print(f"🕐 Current Time: {current_time}")
-        print(f"📝 Total Tasks: {len(tasks)}")
-        print(f"⏳ Pending: {len(pending_tasks)}")
-        print(f"🔥 Active: {len(active_tasks)}")
-        print(f"✅ Completed: {len(completed_tasks)}")
-        print(f"🔑 Groq API: {'✅ Configured' if os.getenv('GROQ_API_KEY') else '❌ Not configured'}")
+        counts = db.count_tasks_by_status()
+        active_tasks = db.get_tasks_by_status("active")
+
+        # The report is assembled first and written once, including the
+        # common empty-database case
+        lines = [
+            "\n📊 System Status",
+            "-" * 30,
+            f"🕐 Current Time: {current_time}",
+            f"📝 Total Tasks: {sum(counts.values())}",
+            f"⏳ Pending: {counts.get('pending', 0)}",
+            f"🔥 Active: {counts.get('active', 0)}",
+            f"✅ Completed: {counts.get('completed', 0)}",
+            f"🔑 Groq API: {'✅ Configured' if _groq_configured() else '❌ Not configured'}",
+        ]
 
         if active_tasks:
-            print("\n🚨 Active Tasks (Need Verification):")
-            for task in active_tasks:
-                print(f"   • {task['task_name']} (ID: {task['id']})")
+            lines.append("\n🚨 Active Tasks (Need Verification):")
+            lines.extend(f"   • {task['task_name']} (ID: {task['id']})" for task in active_tasks)
+
+        print("\n".join(lines))
 
     except Exception as e:
         print(f"❌ Error checking status: {e}")
 
+def _mock_verdict():
+    """Return a random (success, reasoning, confidence) mock verification"""
+    import random
+
+    # One 32-bit draw: the low bit is the outcome, the rest scales confidence
+    bits = random.getrandbits(32)
+    success = bool(bits & 1)
+    fraction = (bits >> 1) / (1 << 31)
+    reasoning = (
+        "Mock verification: Image meets the requirements" if success 
+        else "Mock verification: Image does not meet requirements"
+    )
+    confidence = 0.7 + fraction * 0.25 if success else 0.1 + fraction * 0.3
+    return success, reasoning, confidence
+
 def simulate_verification(task_id):
     """Simulate a verification for testing"""
     try:
-        from main import DatabaseManager
-        import random
+        from datetime import datetime
 
-        db = DatabaseManager("schedule_enforcer.db")
+        db = _get_db("schedule_enforcer.db")
         task = db.get_task(task_id)
 
         if not task:
@@ -135,22 +184,13 @@ def simulate_verification(task_id):
             print(f"❌ Task {task_id} is not active for verification")
             return
 
-        # Create mock image data
-        mock_image = b"mock_image_data_for_testing_purposes"
-        image_b64 = base64.b64encode(mock_image).decode("utf-8")
-
-        # Simulate verification
-        success = random.choice([True, False])
-        reasoning = (
-            "Mock verification: Image meets the requirements" if success 
-            else "Mock verification: Image does not meet requirements"
-        )
-        confidence = random.uniform(0.7, 0.95) if success else random.uniform(0.1, 0.4)
+        now_iso = datetime.now().isoformat()
+        success, reasoning, confidence = _mock_verdict()
 
         # Store verification
         db.store_verification(
             task_id, 
-            image_b64, 
+            None,  # mock verifications have no stored image
             success, 
             reasoning, 
             confidence
@@ -158,7 +198,7 @@ def simulate_verification(task_id):
 
         # Update task status
         if success:
-            db.update_task_status(task_id, "completed", datetime.now().isoformat())
+            db.update_task_status(task_id, "completed", now_iso)
             print(f"✅ Task {task_id} verification successful!")
             print(f"💭 Reasoning: {reasoning}")
         else:
@@ -171,7 +211,44 @@ def simulate_verification(task_id):
     except Exception as e:
         print(f"❌ Error simulating verification: {e}")
 
-def start_server():
+def simulate_batch_verification(ids_file):
+    """Simulate verifications for every task ID listed in a JSON file"""
+    try:
+        import json
+        from datetime import datetime
+
+        with open(ids_file) as f:
+            task_ids = json.load(f)
+
+        db = _get_db("schedule_enforcer.db")
+        records = []
+        completed_ids = []
+
+        for task_id in task_ids:
+            task = db.get_task(task_id)
+            if not task:
+                print(f"❌ Task {task_id} not found")
+                continue
+            if task["status"] not in ["active", "pending"]:
+                print(f"❌ Task {task_id} is not active for verification")
+                continue
+
+            success, reasoning, confidence = _mock_verdict()
+            records.append((task_id, None, success, reasoning, confidence, datetime.now().isoformat()))
+            if success:
+                completed_ids.append(task_id)
+            print(f"{'✅' if success else '❌'} Task {task_id}: {reasoning} ({confidence:.2f})")
+
+        # One transaction for all verifications, one for all completions
+        db.store_verifications(records)
+        db.complete_tasks(completed_ids, datetime.now().isoformat())
+
+        print(f"📊 Verified {len(records)} tasks, {len(completed_ids)} completed")
+
+    except Exception as e:
+        print(f"❌ Error simulating batch verification: {e}")
+
+def start_server(reload=False):
     """Start the FastAPI server"""
     try:
         import uvicorn
@@ -180,47 +257,75 @@ def start_server():
         print("📖 API Docs: http://127.0.0.1:8000/docs")
         print("🛑 Press Ctrl+C to stop")
 
-        uvicorn.run("main:app", host="127.0.0.1", port=8000, reload=True)
+        if reload:
+            # The reloader needs an import string to re-import on changes
+            uvicorn.run("main:app", host="127.0.0.1", port=8000, reload=True)
+        else:
+            # Serve the app object directly: no reloader process or file polling
+            from main import app
+
+            config = uvicorn.Config(app, host="127.0.0.1", port=8000)
+            uvicorn.Server(config).run()
 
     except KeyboardInterrupt:
         print("\n🛑 Server stopped")
     except Exception as e:
         print(f"❌ Error starting server: {e}")
 
+# Commands that take no arguments; verify, verify-batch and server are
+# parsed inline in main()
+_DISPATCH = {
+    "status": check_system_status,
+    "list": list_tasks,
+    "create-test": create_test_task,
+}
+
+def _print_help():
+    """Print CLI usage, the command list and examples"""
+    lines = [_USAGE, "\n\nAI Schedule Enforcer CLI\n\ncommands:\n"]
+    lines.extend(f"  {name:<14}{help_text}\n" for name, help_text in _COMMANDS.items())
+    lines.append(_EXAMPLES.rstrip())
+    sys.stdout.write("".join(lines) + "\n")
+
+def _usage_error(message):
+    """Report a command-line error the way argparse does and exit"""
+    sys.stderr.write(f"{_USAGE}\ncli.py: error: {message}\n")
+    sys.exit(2)
+
 def main():
     """Main CLI function"""
-    parser = argparse.ArgumentParser(
-        description="AI Schedule Enforcer CLI",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  python cli.py status              # Check system status
-  python cli.py list               # List all tasks  
-  python cli.py create-test        # Create a test task
-  python cli.py verify 1           # Simulate verification for task 1
-  python cli.py server             # Start the web server
-        """
-    )
-
-    subparsers = parser.add_subparsers(dest="command", help="Available commands")
-
-    # Status command
-    subparsers.add_parser("status", help="Check system status")
-
-    # List command
-    subparsers.add_parser("list", help="List all scheduled tasks")
-
-    # Create test task command
-    subparsers.add_parser("create-test", help="Create a test task")
-
-    # Verify command
-    verify_parser = subparsers.add_parser("verify", help="Simulate verification")
-    verify_parser.add_argument("task_id", type=int, help="Task ID to verify")
-
-    # Server command
-    subparsers.add_parser("server", help="Start the web server")
-
-    args = parser.parse_args()
+    argv = sys.argv[1:]
+    command = argv[0] if argv else None
+    rest = argv[1:]
+
+    if command in ("-h", "--help") or "-h" in rest or "--help" in rest:
+        _print_help()
+        return
+
+    # Resolve the handler before doing any other work
+    handler = None
+    if command in _DISPATCH:
+        if rest:
+            _usage_error(f"unrecognized arguments: {' '.join(rest)}")
+        handler = _DISPATCH[command]
+    elif command == "verify":
+        if len(rest) != 1:
+            _usage_error("verify requires exactly one task_id")
+        try:
+            task_id = int(rest[0])
+        except ValueError:
+            _usage_error(f"invalid task_id: '{rest[0]}'")
+        handler = lambda: simulate_verification(task_id)
+    elif command == "verify-batch":
+        if len(rest) != 1:
+            _usage_error("verify-batch requires exactly one ids_file")
+        handler = lambda: simulate_batch_verification(rest[0])
+    elif command == "server":
+        if any(arg != "--reload" for arg in rest):
+            _usage_error(f"unrecognized arguments: {' '.join(a for a in rest if a != '--reload')}")
+        handler = lambda: start_server("--reload" in rest)
+    elif command is not None:
+        _usage_error(f"invalid choice: '{command}' (choose from {', '.join(_COMMANDS)})")
 
     # Load environment
     if not load_environment():
@@ -231,18 +336,10 @@ Examples:
     print("=" * 40)
 
     # Execute command
-    if args.command == "status":
-        check_system_status()
-    elif args.command == "list":
-        list_tasks()
-    elif args.command == "create-test":
-        create_test_task()
-    elif args.command == "verify":
-        simulate_verification(args.task_id)
-    elif args.command == "server":
-        start_server()
+    if handler:
+        handler()
     else:
-        parser.print_help()
+        _print_help()
 
 if __name__ == "__main__":
     main()
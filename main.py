@@ -4,21 +4,36 @@ import asyncio
 import threading
 import time
 import base64
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+import logging
+import logging.handlers
+import queue
+from datetime import datetime
+from typing import List, Dict, Any, BinaryIO, Optional, Iterable, Iterator, Set, Tuple
 import sqlite3
 from contextlib import asynccontextmanager
-import json
-from fastapi.responses import FileResponse
+import orjson
+import hashlib
+from collections import OrderedDict
+import httpx
+from fastapi.responses import FileResponse, ORJSONResponse
 
 
 from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends, File, UploadFile, Form
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 import uvicorn
 from playsound import playsound
 import io
+from PIL import Image, ImageOps
+
+# Optional: decode the alarm once and play it from memory with sounddevice.
+# Without it (or without an audio device) playsound is used per alert.
+try:
+    import sounddevice
+    import soundfile
+except (ImportError, OSError):
+    sounddevice = soundfile = None
 
 # LangGraph and LangChain imports
 from langgraph.graph import StateGraph, END, START
@@ -28,25 +43,107 @@ from fastapi.staticfiles import StaticFiles
 # Load environment variables
 load_dotenv()
 
+# Logging: callers only enqueue records; a listener thread does the slow
+# stdout writes, so alarm ticks never block on I/O. The queue handler is
+# attached in the lifespan, not at import: with reload, main.py is imported
+# twice in one process (as __mp_main__ and as main) and only the serving
+# copy's queue is ever drained
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+_log_handler = logging.handlers.QueueHandler(_log_queue)
+logger = logging.getLogger("schedule_enforcer")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+_log_stream = logging.StreamHandler()
+_log_stream.setFormatter(logging.Formatter("%(message)s"))
+log_listener = logging.handlers.QueueListener(_log_queue, _log_stream)
+
 # Database setup
 DATABASE_URL = "schedule_enforcer.db"
 
+# Alarm sound
+ALARM_SOUND_PATH = "web/alarm.wav"
+ALARM_INTERVAL_SECONDS = 2
+# How soon the scheduler retries a failed due-task lookup
+SCHEDULER_RETRY_SECONDS = 5
+# A failing audio backend is reported at most this often
+ALARM_SOUND_WARNING_INTERVAL_SECONDS = 60
+ALARM_PCM, ALARM_SAMPLE_RATE = None, None
+if soundfile is not None:
+    try:
+        ALARM_PCM, ALARM_SAMPLE_RATE = soundfile.read(ALARM_SOUND_PATH, dtype="int16")
+    except Exception as e:
+        print(f"Could not preload alarm sound, falling back to playsound: {e}")
+
+# Verification photos are stored here rather than inline in the database
+UPLOAD_DIR = "uploads"
+# Unreferenced photos are only removed once unused for this long, so a
+# /verify that has saved its photo but not yet written its row keeps it
+UPLOAD_SWEEP_GRACE_SECONDS = 600
+UPLOAD_SWEEP_INTERVAL_SECONDS = 600
+
+# Vision models resize internally; larger uploads only cost bandwidth
+MAX_IMAGE_EDGE = 1024
+
+TASK_COLUMNS = (
+    "id, task_name, start_time, task_duration, alert_gap, "
+    "verification_instructions, status, created_at, completed_at"
+)
+
+# Columns needed to display a task in listings and status summaries.
+# Instructions are cut to their listing preview length inside SQLite.
+TASK_SUMMARY_COLUMNS = (
+    "id, task_name, start_time, task_duration, "
+    "substr(verification_instructions, 1, 50) AS verification_instructions, status"
+)
+
+GROQ_VISION_MODEL = "meta-llama/llama-4-scout-17b-16e-instruct"
+
+# Groq verification prompt, split around the task's instructions. The head
+# is byte-identical on every request, so only the middle varies
+PROMPT_HEAD = 'Please analyze this image for compliance with the following verification instructions: "'
+PROMPT_TAIL = '''"
+
+Return your response in this exact JSON format:
+{
+    "success": true/false,
+    "reasoning": "detailed explanation of what you see and why it passes/fails verification",
+    "confidence": 0.0-1.0
+}
+
+Focus on:
+1. Whether the image meets the specific requirements in the instructions
+2. The clarity and quality of the image
+3. Any relevant details that support or contradict the requirements
+4.Return only raw JSON without any markdown formatting or code fences.
+5.Confidence should be low if picture doesn't match with verification and should be hoh if it matches.
+'''
+
+# In-process cache of Groq verdicts keyed by (image, instructions, model)
+VERIFICATION_CACHE_SIZE = 1024
+VERIFICATION_CACHE_MIN_CONFIDENCE = 0.7
+
+# Near-duplicate cache: a burst of almost identical camera frames reuses a
+# successful verdict when their 64-bit difference hashes are this close
+SIMILAR_IMAGE_MAX_DISTANCE = 6
+SIMILAR_IMAGE_CACHE_TTL_SECONDS = 3600
+
+# Rows for a task deleted meanwhile (e.g. still queued in VerificationWriter)
+# are skipped; the task id is bound a second time for the EXISTS check
+INSERT_VERIFICATION_SQL = """
+    INSERT INTO verifications
+    (task_id, image_data, image_path, success, reasoning, confidence, timestamp)
+    SELECT ?, '', ?, ?, ?, ?, ?
+    WHERE EXISTS (SELECT 1 FROM schedule_tasks WHERE id = ?)
+"""
+
 # Pydantic models
 class ScheduleTask(BaseModel):
     task_name: str = Field(..., min_length=1, max_length=100)
-    start_time: str = Field(..., pattrn=r"^([0-1]?[0-9]|2[0-3]):[0-5][0-9]$")  # HH:MM format
+    start_time: str = Field(..., pattern=r"^([0-1]?[0-9]|2[0-3]):[0-5][0-9]$")  # HH:MM, 24-hour format
     task_duration: int = Field(..., ge=1, le=1440)  # minutes, max 24 hours
     alert_gap: int = Field(..., ge=1, le=60)  # minutes between verifications
     verification_instructions: str = Field(..., min_length=10, max_length=500)
 
-    @validator("start_time")
-    def validate_start_time(cls, v):
-        try:
-            datetime.strptime(v, "%H:%M")
-            return v
-        except ValueError:
-            raise ValueError("Invalid time format. Use HH:MM (24-hour format)")
-
 class ScheduleTaskResponse(BaseModel):
     id: int
     task_name: str
@@ -75,23 +172,49 @@ class WorkflowState(BaseModel):
     task_start_time: str
     verification_instructions: str
     image_data: Optional[str] = None
+    image_path: Optional[str] = None
+    image_hash: Optional[int] = None  # difference hash of the upload, see image_dhash
     verification_result: Optional[Dict[str, Any]] = None
-    step: str = "check_time"
+    step: str = "trigger_alarm"
     alarm_active: bool = False
 
+def hhmm_to_minutes(hhmm: str) -> int:
+    """Convert an HH:MM string to minutes since midnight"""
+    hour, minute = hhmm.split(":")
+    return int(hour) * 60 + int(minute)
+
 # Database operations
 class DatabaseManager:
     def __init__(self, db_path: str):
         self.db_path = db_path
+        # Connections are pooled per thread and kept open, so each API worker,
+        # the monitor and the CLI reuse a warm connection without sharing one
+        self._local = threading.local()
         self.init_database()
 
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """This thread's long-lived connection, opened on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            # With WAL, NORMAL only fsyncs at checkpoints and stays crash-safe
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-20000")  # ~20MB page cache
+            self._local.conn = conn
+        return conn
+
     def init_database(self):
-        with sqlite3.connect(self.db_path) as conn:
+        with self.conn as conn:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS schedule_tasks (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     task_name TEXT NOT NULL,
                     start_time TEXT NOT NULL,
+                    start_minute INTEGER NULL,
                     task_duration INTEGER NOT NULL,
                     alert_gap INTEGER NOT NULL,
                     verification_instructions TEXT NOT NULL,
@@ -105,7 +228,8 @@ class DatabaseManager:
                 CREATE TABLE IF NOT EXISTS verifications (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     task_id INTEGER NOT NULL,
-                    image_data TEXT NOT NULL,
+                    image_data TEXT NOT NULL DEFAULT '',
+                    image_path TEXT NULL,
                     success BOOLEAN NOT NULL,
                     reasoning TEXT NOT NULL,
                     confidence REAL NOT NULL,
@@ -113,18 +237,46 @@ class DatabaseManager:
                     FOREIGN KEY (task_id) REFERENCES schedule_tasks (id)
                 )
             """)
+
+            # Older databases stored the base64 image inline; images now live
+            # on disk and only their path is recorded
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(verifications)")}
+            if "image_path" not in columns:
+                conn.execute("ALTER TABLE verifications ADD COLUMN image_path TEXT NULL")
+
+            # start_time parsed once into minutes since midnight, so the
+            # scheduler's lookup is an integer point query on the index
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(schedule_tasks)")}
+            if "start_minute" not in columns:
+                conn.execute("ALTER TABLE schedule_tasks ADD COLUMN start_minute INTEGER NULL")
+            conn.execute("""
+                UPDATE schedule_tasks
+                SET start_minute = CAST(substr(start_time, 1, instr(start_time, ':') - 1) AS INTEGER) * 60
+                                 + CAST(substr(start_time, instr(start_time, ':') + 1) AS INTEGER)
+                WHERE start_minute IS NULL
+            """)
+
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_tasks_status_start ON schedule_tasks (status, start_time)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_tasks_status_minute ON schedule_tasks (status, start_minute)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_verif_task ON verifications (task_id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_verif_image_path ON verifications (image_path)")
             conn.commit()
 
     def create_task(self, task: ScheduleTask) -> int:
-        with sqlite3.connect(self.db_path) as conn:
+        with self.conn as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 INSERT INTO schedule_tasks 
-                (task_name, start_time, task_duration, alert_gap, verification_instructions, created_at)
-                VALUES (?, ?, ?, ?, ?, ?)
+                (task_name, start_time, start_minute, task_duration, alert_gap, verification_instructions, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
             """, (
                 task.task_name, 
                 task.start_time, 
+                hhmm_to_minutes(task.start_time),
                 task.task_duration, 
                 task.alert_gap, 
                 task.verification_instructions,
@@ -133,32 +285,66 @@ class DatabaseManager:
             return cursor.lastrowid
     def delete_task(self, task_id: int) -> bool:
         """Delete a task and its verifications"""
-        with sqlite3.connect(self.db_path) as conn:
-        # Delete verifications first
-          conn.execute("DELETE FROM verifications WHERE task_id = ?", (task_id,))
-        # Delete task
-          cursor = conn.execute("DELETE FROM schedule_tasks WHERE id = ?", (task_id,))
-          conn.commit()
-          return cursor.rowcount > 0
+        with self.conn as conn:
+            # Delete verifications first (foreign key constraint). Photos are
+            # left to sweep_uploads: other tasks or in-flight uploads may share them
+            conn.execute("DELETE FROM verifications WHERE task_id = ?", (task_id,))
+            cursor = conn.execute("DELETE FROM schedule_tasks WHERE id = ?", (task_id,))
+            return cursor.rowcount > 0
+
+    def is_image_referenced(self, image_path: str) -> bool:
+        """Whether any verification still points at image_path"""
+        cursor = self.conn.execute(
+            "SELECT 1 FROM verifications WHERE image_path = ? LIMIT 1", (image_path,)
+        )
+        return cursor.fetchone() is not None
     
 
     def get_all_tasks(self) -> List[Dict[str, Any]]:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self.conn as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM schedule_tasks ORDER BY start_time")
+            cursor.execute(f"SELECT {TASK_COLUMNS} FROM schedule_tasks ORDER BY start_time")
+            return [dict(row) for row in cursor.fetchall()]
+
+    def count_tasks_by_status(self) -> Dict[str, int]:
+        """Return the number of tasks in each status"""
+        with self.conn as conn:
+            cursor = conn.execute("SELECT status, COUNT(*) FROM schedule_tasks GROUP BY status")
+            return {status: count for status, count in cursor.fetchall()}
+
+    def iter_tasks(self, status: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Yield task summaries (instructions truncated) ordered by start time, optionally filtered by status"""
+        query = f"SELECT {TASK_SUMMARY_COLUMNS} FROM schedule_tasks"
+        params: Tuple = ()
+        if status is not None:
+            query += " WHERE status = ?"
+            params = (status,)
+        for row in self.conn.execute(query + " ORDER BY start_time", params):
+            yield dict(row)
+
+    def get_tasks_by_status(self, status: str) -> List[Dict[str, Any]]:
+        """Get task summaries with the given status, ordered by start time"""
+        return list(self.iter_tasks(status))
+
+    def get_pending_at(self, start_minute: int) -> List[Dict[str, Any]]:
+        """Get pending tasks due to start at the given minute since midnight"""
+        with self.conn as conn:
+            cursor = conn.execute(
+                "SELECT id, task_name, start_time, verification_instructions FROM schedule_tasks "
+                "WHERE status = 'pending' AND start_minute = ?",
+                (start_minute,)
+            )
             return [dict(row) for row in cursor.fetchall()]
 
     def get_task(self, task_id: int) -> Optional[Dict[str, Any]]:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self.conn as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM schedule_tasks WHERE id = ?", (task_id,))
+            cursor.execute(f"SELECT {TASK_COLUMNS} FROM schedule_tasks WHERE id = ?", (task_id,))
             row = cursor.fetchone()
             return dict(row) if row else None
 
     def update_task_status(self, task_id: int, status: str, completed_at: Optional[str] = None):
-        with sqlite3.connect(self.db_path) as conn:
+        with self.conn as conn:
             if completed_at:
                 conn.execute(
                     "UPDATE schedule_tasks SET status = ?, completed_at = ? WHERE id = ?",
@@ -171,48 +357,289 @@ class DatabaseManager:
                 )
             conn.commit()
 
-    def store_verification(self, task_id: int, image_data: str, success: bool, reasoning: str, confidence: float):
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                INSERT INTO verifications 
-                (task_id, image_data, success, reasoning, confidence, timestamp)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (task_id, image_data, success, reasoning, confidence, datetime.now().isoformat()))
+    def store_verification(self, task_id: int, image_path: Optional[str], success: bool, reasoning: str, confidence: float):
+        with self.conn as conn:
+            conn.execute(INSERT_VERIFICATION_SQL, (
+                task_id, image_path, success, reasoning, confidence, datetime.now().isoformat(), task_id
+            ))
             conn.commit()
 
+    def store_verifications(self, records: Iterable[Tuple[int, Optional[str], bool, str, float, str]]):
+        """Store (task_id, image_path, success, reasoning, confidence, timestamp) rows in one transaction"""
+        with self.conn as conn:
+            conn.executemany(INSERT_VERIFICATION_SQL, (record + (record[0],) for record in records))
+
+    def record_verification_and_complete(
+        self, task_id: int, image_path: Optional[str], success: bool, reasoning: str, confidence: float
+    ):
+        """Store a verification and mark its task completed in one transaction"""
+        now = datetime.now().isoformat()
+        with self.conn as conn:
+            # Take the write lock up front so the pair can't be interleaved
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(INSERT_VERIFICATION_SQL, (
+                task_id, image_path, success, reasoning, confidence, now, task_id
+            ))
+            conn.execute(
+                "UPDATE schedule_tasks SET status = 'completed', completed_at = ? WHERE id = ?",
+                (now, task_id)
+            )
+
+    def complete_tasks(self, task_ids: Iterable[int], completed_at: str):
+        """Mark several tasks completed in one transaction"""
+        with self.conn as conn:
+            conn.executemany(
+                "UPDATE schedule_tasks SET status = 'completed', completed_at = ? WHERE id = ?",
+                ((completed_at, task_id) for task_id in task_ids)
+            )
+
+def image_dhash(img: Image.Image) -> int:
+    """64-bit difference hash: one bit per horizontally adjacent pixel pair of a 9x8 grayscale thumbnail"""
+    pixels = list(img.convert("L").resize((9, 8), Image.LANCZOS).getdata())
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            bits = (bits << 1) | (left > pixels[row * 9 + col + 1])
+    return bits
+
+def downsample_image(image_file: BinaryIO) -> Tuple[bytes, Optional[int]]:
+    """Shrink an upload to MAX_IMAGE_EDGE on its longest side and re-encode it as JPEG.
+
+    Returns the JPEG bytes and the image's difference hash (None if Pillow
+    could not decode the upload).
+    """
+    try:
+        # Pillow reads the (spooled) upload file directly, decoding as it goes
+        with Image.open(image_file) as img:
+            # Re-encoding drops EXIF, so apply the camera orientation first
+            img = ImageOps.exif_transpose(img)
+            img.thumbnail((MAX_IMAGE_EDGE, MAX_IMAGE_EDGE), Image.LANCZOS)
+            if img.mode != "RGB":
+                img = img.convert("RGB")
+            buffer = io.BytesIO()
+            img.save(buffer, "JPEG", quality=85, optimize=True)
+            return buffer.getvalue(), image_dhash(img)
+    except Exception:
+        # Pillow could not process it (undecodable, a decompression bomb, or
+        # malformed EXIF); pass it through unchanged
+        image_file.seek(0)
+        return image_file.read(), None
+
+def save_upload(image_content: bytes) -> str:
+    """Write an uploaded image to UPLOAD_DIR, named by its SHA-256, and return its path"""
+    digest = hashlib.sha256(image_content).hexdigest()
+    path = os.path.join(UPLOAD_DIR, f"{digest}.jpg")
+    # Content-addressed, so a resubmitted photo is stored only once; reusing
+    # it refreshes its mtime so sweep_uploads treats it as in use
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        os.makedirs(UPLOAD_DIR, exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(image_content)
+    return path
+
+def sweep_uploads(db: DatabaseManager) -> int:
+    """Remove photos no verification references and nothing has used within
+    UPLOAD_SWEEP_GRACE_SECONDS; returns how many were removed"""
+    cutoff = time.time() - UPLOAD_SWEEP_GRACE_SECONDS
+    removed = 0
+    try:
+        entries = list(os.scandir(UPLOAD_DIR))
+    except FileNotFoundError:
+        return 0
+    for entry in entries:
+        try:
+            if not entry.is_file() or entry.stat().st_mtime > cutoff:
+                continue
+            if db.is_image_referenced(entry.path):
+                continue
+            os.remove(entry.path)
+            removed += 1
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning("Could not remove upload %s: %s", entry.path, e)
+    return removed
+
+async def sweep_uploads_periodically(db: DatabaseManager):
+    while True:
+        try:
+            removed = await asyncio.to_thread(sweep_uploads, db)
+            if removed:
+                logger.info("Removed %d unreferenced uploads", removed)
+        except Exception:
+            logger.exception("Upload sweep failed")
+        await asyncio.sleep(UPLOAD_SWEEP_INTERVAL_SECONDS)
+
+# Queued by VerificationWriter.stop() after the last row to flush
+_STOP_WRITER = object()
+
+class VerificationWriter:
+    """Buffers verification rows and writes them to the database in batches"""
+
+    def __init__(self, db: DatabaseManager, batch_size: int = 50, flush_interval: float = 0.1):
+        self.db = db
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def submit(self, task_id: int, image_path: Optional[str], success: bool, reasoning: str, confidence: float):
+        if self.queue is None:
+            # Writer not running (outside the app lifespan): write directly
+            self.db.store_verification(task_id, image_path, success, reasoning, confidence)
+            return
+        self.queue.put_nowait(
+            (task_id, image_path, success, reasoning, confidence, datetime.now().isoformat())
+        )
+
+    async def run(self, queue: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        batch = []
+        stopping = False
+        while not stopping:
+            item = await queue.get()
+            stopping = item is _STOP_WRITER
+            if not stopping:
+                batch.append(item)
+            deadline = loop.time() + self.flush_interval
+
+            # Collect until the batch is full, the flush interval passes
+            # or stop() asks for the final flush
+            while not stopping and len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                stopping = item is _STOP_WRITER
+                if not stopping:
+                    batch.append(item)
+
+            if batch:
+                pending, batch = batch, []
+                await self._write(pending)
+
+    async def _write(self, rows: List[Tuple[int, Optional[str], bool, str, float, str]]):
+        # A failed write is logged and never ends the writer, or later rows
+        # would pile up on a queue nothing drains
+        try:
+            await asyncio.to_thread(self.db.store_verifications, rows)
+            return
+        except Exception:
+            logger.exception("Batched write of %d verifications failed, retrying row by row", len(rows))
+        # Keep every row that can still be written (e.g. after a transient lock)
+        for row in rows:
+            try:
+                await asyncio.to_thread(self.db.store_verifications, [row])
+            except Exception:
+                logger.exception("Dropped verification for task %s", row[0])
+
+    def start(self):
+        self.queue = asyncio.Queue()
+        self._task = asyncio.create_task(self.run(self.queue))
+
+    async def stop(self):
+        """Flush everything queued so far and stop the writer"""
+        if self._task:
+            # Shut down with a sentinel rather than cancel(): a cancel can be
+            # swallowed by wait_for and leave stop() waiting forever. Rows
+            # submitted from here on are written directly
+            queue, self.queue = self.queue, None
+            queue.put_nowait(_STOP_WRITER)
+            await self._task
+            self._task = None
+
 # Groq Vision Service
 class GroqVisionService:
     def __init__(self, api_key: str):
+        self.model = GROQ_VISION_MODEL
+        # One pooled HTTP/2 client for every request, so concurrent
+        # verifications share a kept-alive TLS session instead of handshaking
+        self.http_client = httpx.AsyncClient(
+            http2=True,
+            timeout=30,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+        )
+        # temperature=0 keeps answers deterministic, which makes them cacheable
         self.client = ChatGroq(
             api_key=api_key,
-            model="meta-llama/llama-4-scout-17b-16e-instruct",
-            temperature=0.2,
-            max_tokens=1024
+            model=self.model,
+            temperature=0,
+            max_tokens=1024,
+            http_async_client=self.http_client
         )
+        self._cache: "OrderedDict[str, VerificationResponse]" = OrderedDict()
+        # (image_hash, instructions) -> (cached_at, verdict); successes only
+        self._similar: "OrderedDict[Tuple[int, str], Tuple[float, VerificationResponse]]" = OrderedDict()
+
+    async def aclose(self):
+        await self.http_client.aclose()
+
+    def _cache_key(self, image_data: str, instructions: str) -> str:
+        digest = hashlib.sha256()
+        for part in (image_data, instructions, self.model):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _remember(self, key: str, result: VerificationResponse):
+        # Only confident answers are cached so a shaky verdict is re-checked
+        if result.confidence <= VERIFICATION_CACHE_MIN_CONFIDENCE:
+            return
+        self._cache[key] = result
+        self._cache.move_to_end(key)
+        if len(self._cache) > VERIFICATION_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    def _find_similar(self, image_hash: int, instructions: str) -> Optional[VerificationResponse]:
+        now = time.monotonic()
+        for (cached_hash, cached_instructions), (cached_at, result) in list(self._similar.items()):
+            if now - cached_at > SIMILAR_IMAGE_CACHE_TTL_SECONDS:
+                del self._similar[(cached_hash, cached_instructions)]
+                continue
+            if (cached_instructions == instructions
+                    and bin(cached_hash ^ image_hash).count("1") <= SIMILAR_IMAGE_MAX_DISTANCE):
+                return result
+        return None
+
+    def _remember_similar(self, image_hash: int, instructions: str, result: VerificationResponse):
+        # Failures are never reused, so a retry after a rejection is always re-checked
+        if not result.success or result.confidence <= VERIFICATION_CACHE_MIN_CONFIDENCE:
+            return
+        key = (image_hash, instructions)
+        self._similar[key] = (time.monotonic(), result)
+        self._similar.move_to_end(key)
+        if len(self._similar) > VERIFICATION_CACHE_SIZE:
+            self._similar.popitem(last=False)
+
+    async def verify_image(
+        self, image_data: str, instructions: str, image_hash: Optional[int] = None
+    ) -> VerificationResponse:
+        # Identical image + instructions (e.g. a resubmitted photo) skip the API call
+        key = self._cache_key(image_data, instructions)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached.model_copy(update={"timestamp": datetime.now().isoformat()})
+
+        # So does a near-identical frame of something already verified
+        if image_hash is not None:
+            cached = self._find_similar(image_hash, instructions)
+            if cached is not None:
+                return cached.model_copy(update={"timestamp": datetime.now().isoformat()})
 
-    async def verify_image(self, image_data: str, instructions: str) -> VerificationResponse:
         try:
             # Create the vision prompt
             message = HumanMessage(
                 content=[
                     {
                         "type": "text",
-                        "text": f"""Please analyze this image for compliance with the following verification instructions: "{instructions}"
-
-Return your response in this exact JSON format:
-{{
-    "success": true/false,
-    "reasoning": "detailed explanation of what you see and why it passes/fails verification",
-    "confidence": 0.0-1.0
-}}
-
-Focus on:
-1. Whether the image meets the specific requirements in the instructions
-2. The clarity and quality of the image
-3. Any relevant details that support or contradict the requirements
-4.Return only raw JSON without any markdown formatting or code fences.
-5.Confidence should be low if picture doesn't match with verification and should be hoh if it matches.
-"""
+                        "text": PROMPT_HEAD + instructions + PROMPT_TAIL
                     },
                     {
                         "type": "image_url",
@@ -228,14 +655,18 @@ Focus on:
 
             # Parse the JSON response
             try:
-                result = json.loads(response.content)
-                return VerificationResponse(
+                result = orjson.loads(response.content)
+                verification = VerificationResponse(
                     success=result["success"],
                     reasoning=result["reasoning"],
                     confidence=result["confidence"],
                     timestamp=datetime.now().isoformat()
                 )
-            except (json.JSONDecodeError, KeyError) as e:
+                self._remember(key, verification)
+                if image_hash is not None:
+                    self._remember_similar(image_hash, instructions, verification)
+                return verification
+            except (orjson.JSONDecodeError, KeyError) as e:
                 # Fallback if JSON parsing fails
                 return VerificationResponse(
                     success=False,
@@ -252,186 +683,173 @@ Focus on:
                 timestamp=datetime.now().isoformat()
             )
 
+def play_alarm_sound():
+    """Start the alarm sound without blocking the caller"""
+    if ALARM_PCM is not None:
+        try:
+            sounddevice.play(ALARM_PCM, ALARM_SAMPLE_RATE)
+            return
+        except Exception as e:
+            # e.g. no output device right now; playsound may still work
+            logger.debug("sounddevice playback failed, falling back to playsound: %s", e)
+    playsound(ALARM_SOUND_PATH, block=False)
+
 class AlarmSystem:
     def __init__(self):
-        self.active_alarms: Dict[int, threading.Event] = {}
-        self.alarm_threads: Dict[int, threading.Thread] = {}
-        self.warning_alerts: Dict[int, threading.Event] = {}
+        # task_id -> {"task_name": ..., "alert_count": ...}; one shared tick
+        # sounds every entry, so ringing alarms need no thread of their own
+        self.active_alarms: Dict[int, Dict[str, Any]] = {}
+        self.warning_alerts: Set[int] = set()
+        self._last_sound_warning: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
 
     def start_alarm(self, task_id: int, task_name: str):
         if task_id in self.active_alarms:
             return # Alarm already active
 
-        stop_event = threading.Event()
-        self.active_alarms[task_id] = stop_event
-
-        def alarm_loop():
-            print(f"\n🚨 ALARM ACTIVE for task: {task_name} 🚨")
-            alert_count = 0
-            while not stop_event.wait(timeout=2): # Check every 2 seconds
-                alert_count += 1
-                print(f"⏰ ATTENTION: Complete verification for '{task_name}'! (Alert #{alert_count})")
-                
-                # Play actual alarm sound if file exists
-                try:
-                    playsound("web/alarm.wav", block=False)
-                except Exception as e:
-                    print(f"Could not play alarm sound: {e}")
-
-        alarm_thread = threading.Thread(target=alarm_loop, daemon=True)
-        self.alarm_threads[task_id] = alarm_thread
-        alarm_thread.start()
-        print(f"Alarm started for task {task_id}: {task_name}")
+        self.active_alarms[task_id] = {"task_name": task_name, "alert_count": 0}
+        logger.info("🚨 ALARM ACTIVE for task: %s 🚨", task_name)
+        logger.info("Alarm started for task %s: %s", task_id, task_name)
 
     def start_warning_alert(self, task_id: int, task_name: str, minutes_until: int):
         """Start warning alert before task begins"""
         if task_id in self.warning_alerts:
             return
-            
-        stop_event = threading.Event()
-        self.warning_alerts[task_id] = stop_event
-        
-        def warning_loop():
-            print(f"\n⚠️ WARNING: Task '{task_name}' starts in {minutes_until} minutes!")
-            print(f"🔄 Get ready to verify with camera when task becomes active.")
-            # You can add sound here too
-            
-        warning_thread = threading.Thread(target=warning_loop, daemon=True)
-        warning_thread.start()
-
-    def stop_alarm(self, task_id: int):
-        if task_id in self.active_alarms:
-            self.active_alarms[task_id].set()
-            del self.active_alarms[task_id]
 
-        if task_id in self.alarm_threads:
-            del self.alarm_threads[task_id]
+        self.warning_alerts.add(task_id)
+        logger.warning("⚠️ WARNING: Task '%s' starts in %s minutes!", task_name, minutes_until)
+        logger.info("🔄 Get ready to verify with camera when task becomes active.")
 
-        if task_id in self.warning_alerts:
-            self.warning_alerts[task_id].set()
-            del self.warning_alerts[task_id]
-
-        print(f"Alarm stopped for task {task_id}")
+    def stop_alarm(self, task_id: int):
+        self.active_alarms.pop(task_id, None)
+        self.warning_alerts.discard(task_id)
+        logger.info("Alarm stopped for task %s", task_id)
 
     def is_alarm_active(self, task_id: int) -> bool:
         return task_id in self.active_alarms
 
+    async def run(self):
+        while True:
+            await asyncio.sleep(ALARM_INTERVAL_SECONDS)
+            if not self.active_alarms:
+                continue
+
+            for alarm in self.active_alarms.values():
+                alarm["alert_count"] += 1
+                logger.info(
+                    "⏰ ATTENTION: Complete verification for '%s'! (Alert #%s)",
+                    alarm["task_name"], alarm["alert_count"]
+                )
 
-# LangGraph Workflow
-def create_verification_workflow(db: DatabaseManager, groq_service: GroqVisionService, alarm_system: AlarmSystem):
+            # One sound per tick covers every ringing alarm. Audio errors can be
+            # transient, so keep trying every tick but only warn now and then
+            try:
+                # playsound opens the file and sets up a player session on
+                # every call, so keep that off the event loop
+                await asyncio.to_thread(play_alarm_sound)
+            except Exception as e:
+                now = time.monotonic()
+                if (self._last_sound_warning is None
+                        or now - self._last_sound_warning >= ALARM_SOUND_WARNING_INTERVAL_SECONDS):
+                    self._last_sound_warning = now
+                    logger.warning("Could not play alarm sound: %s", e)
 
-    async def check_schedule_node(state: WorkflowState) -> WorkflowState:
-        current_time = datetime.now().strftime("%H:%M")
-        state.current_time = current_time
+    def start(self):
+        self._task = asyncio.create_task(self.run())
 
-        # Check if current time matches task start time
-        if current_time == state.task_start_time:
-            state.step = "trigger_alarm"
-            state.alarm_active = True
-        else:
-            state.step = "check_time"
+    def stop(self):
+        if self._task:
+            self._task.cancel()
 
-        return state
+
+# LangGraph Workflow
+def create_verification_workflow(db: DatabaseManager, groq_service: GroqVisionService, alarm_system: AlarmSystem):
 
     async def trigger_alarm_node(state: WorkflowState) -> WorkflowState:
         if state.alarm_active and not alarm_system.is_alarm_active(state.task_id):
-            task = db.get_task(state.task_id)
+            task = await asyncio.to_thread(db.get_task, state.task_id)
             if task:
                 alarm_system.start_alarm(state.task_id, task["task_name"])
-                db.update_task_status(state.task_id, "active")
+                await asyncio.to_thread(db.update_task_status, state.task_id, "active")
 
+        # The graph stops here; /verify invokes it again once a photo arrives
         state.step = "wait_upload"
         return state
 
-    async def wait_upload_node(state: WorkflowState) -> WorkflowState:
-        # This node waits for image upload (handled by API endpoint)
-        if state.image_data:
-            state.step = "groq_verify"
-        return state
-
     async def groq_verify_node(state: WorkflowState) -> WorkflowState:
         if state.image_data:
             verification_result = await groq_service.verify_image(
                 state.image_data, 
-                state.verification_instructions
-            )
-
-            state.verification_result = verification_result.dict()
-
-            # Store verification in database
-            db.store_verification(
-                state.task_id,
-                state.image_data,
-                verification_result.success,
-                verification_result.reasoning,
-                verification_result.confidence
+                state.verification_instructions,
+                state.image_hash
             )
 
+            state.verification_result = verification_result.model_dump()
             state.step = "complete_retry"
 
         return state
 
     async def complete_retry_node(state: WorkflowState) -> WorkflowState:
-        if state.verification_result and state.verification_result["success"]:
-            # Verification successful - stop alarm and mark complete
+        result = state.verification_result
+        if result and result["success"]:
+            # Verification successful - stop alarm, then record the
+            # verification and mark the task complete in one transaction
             alarm_system.stop_alarm(state.task_id)
-            db.update_task_status(state.task_id, "completed", datetime.now().isoformat())
+            await asyncio.to_thread(
+                db.record_verification_and_complete,
+                state.task_id,
+                state.image_path,
+                result["success"],
+                result["reasoning"],
+                result["confidence"]
+            )
             state.step = "end"
         else:
-            # Verification failed - continue alarm and wait for retry
+            # Verification failed - queue it for the batched write, keep
+            # the alarm ringing and wait for a retry
+            if result:
+                verification_writer.submit(
+                    state.task_id,
+                    state.image_path,
+                    result["success"],
+                    result["reasoning"],
+                    result["confidence"]
+                )
             state.step = "wait_upload"
             state.image_data = None  # Clear image data for retry
+            state.image_path = None
+            state.image_hash = None
 
         return state
 
-    # Build the workflow graph
+    # Build the workflow graph. The scheduler's timer invokes it once when
+    # the task's minute arrives and /verify invokes it once per upload, so
+    # no node has to poll the clock or wait for the image
     workflow = StateGraph(WorkflowState)
 
     # Add nodes
-    workflow.add_node("check_time", check_schedule_node)
-    workflow.add_node("trigger_alarm", trigger_alarm_node) 
-    workflow.add_node("wait_upload", wait_upload_node)
+    workflow.add_node("trigger_alarm", trigger_alarm_node)
     workflow.add_node("groq_verify", groq_verify_node)
     workflow.add_node("complete_retry", complete_retry_node)
 
     # Add edges
-    workflow.set_entry_point("check_time")
-
-    workflow.add_conditional_edges(
-        "check_time",
-        lambda state: "trigger_alarm" if state.step == "trigger_alarm" else "check_time",
+    workflow.set_conditional_entry_point(
+        lambda state: "groq_verify" if state.image_data else "trigger_alarm",
         {
             "trigger_alarm": "trigger_alarm",
-            "check_time": "check_time"
-        }
-    )
-
-    workflow.add_edge("trigger_alarm", "wait_upload")
-
-    workflow.add_conditional_edges(
-        "wait_upload",
-        lambda state: "groq_verify" if state.step == "groq_verify" else "wait_upload",
-        {
-            "groq_verify": "groq_verify",
-            "wait_upload": "wait_upload"
+            "groq_verify": "groq_verify"
         }
     )
 
+    workflow.add_edge("trigger_alarm", END)
     workflow.add_edge("groq_verify", "complete_retry")
-
-    workflow.add_conditional_edges(
-        "complete_retry",
-        lambda state: END if state.step == "end" else "wait_upload",
-        {
-            END: END,
-            "wait_upload": "wait_upload"
-        }
-    )
+    workflow.add_edge("complete_retry", END)
 
     return workflow.compile()
 
 # Initialize services
 db = DatabaseManager(DATABASE_URL)
+verification_writer = VerificationWriter(db)
 groq_api_key = os.getenv("GROQ_API_KEY")
 if not groq_api_key:
     print("WARNING: GROQ_API_KEY not found in environment variables. Using mock responses.")
@@ -447,34 +865,68 @@ class TaskScheduler:
         self.running = True
         self.active_tasks: Dict[int, WorkflowState] = {}
         self.workflow = create_verification_workflow(db, groq_service, alarm_system) if groq_service else None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop_task: Optional[asyncio.Task] = None
+
+    def schedule(self, task_id: int, start_time: str):
+        """Start a task created during its own start minute right away; every
+        other pending task is found by the loop's lookup for its minute"""
+        now = datetime.now()
+        if self._wakeup and hhmm_to_minutes(start_time) == now.hour * 60 + now.minute:
+            self._wakeup.set()
+
+    async def _start_due_tasks(self, minute: int):
+        # One indexed lookup finds every task due this minute; deleted or
+        # already handled tasks are no longer pending and simply don't match
+        for task in await asyncio.to_thread(db.get_pending_at, minute):
+            if task["id"] in self.active_tasks:
+                continue
+
+            state = WorkflowState(
+                task_id=task["id"],
+                task_start_time=task["start_time"],
+                verification_instructions=task["verification_instructions"],
+                current_time="%02d:%02d" % divmod(minute, 60),
+                alarm_active=True
+            )
 
-    def start_monitoring(self):
-        def monitor_loop():
-            while self.running:
-                current_time = datetime.now().strftime("%H:%M")
-
-                # Check for tasks that should be starting
-                tasks = db.get_all_tasks()
-                for task in tasks:
-                    if (task["status"] == "pending" and 
-                        task["start_time"] == current_time and 
-                        task["id"] not in self.active_tasks):
-
-                        # Start workflow for this task
-                        state = WorkflowState(
-                            task_id=task["id"],
-                            task_start_time=task["start_time"],
-                            verification_instructions=task["verification_instructions"],
-                            current_time=current_time
-                        )
-
-                        self.active_tasks[task["id"]] = state
-                        print(f"Started monitoring task {task['id']}: {task['task_name']}")
-
-                time.sleep(30)  # Check every 30 seconds
+            self.active_tasks[task["id"]] = state
+            try:
+                if self.workflow:
+                    await self.workflow.ainvoke(state)
+            except Exception:
+                # One task failing to start must not end the scheduler loop
+                # and with it every later alarm
+                self.active_tasks.pop(task["id"], None)
+                logger.exception("Could not start task %s: %s", task["id"], task["task_name"])
+                continue
+            logger.info("Started monitoring task %s: %s", task["id"], task["task_name"])
+
+    async def run(self):
+        # Once per minute, one indexed (status, start_minute) lookup finds every
+        # task due that minute, wherever it was created (API, cli.py, another
+        # process); between minute boundaries the loop does no work
+        self._wakeup = asyncio.Event()
+        while self.running:
+            self._wakeup.clear()
+            now = datetime.now()
+            try:
+                await self._start_due_tasks(now.hour * 60 + now.minute)
+                timeout = 60 - time.time() % 60
+            except Exception:
+                # e.g. "database is locked"; retry shortly, still inside this
+                # minute, rather than letting the only scheduler task die
+                logger.exception("Scheduler lookup failed, retrying")
+                timeout = SCHEDULER_RETRY_SECONDS
+
+            # Sleep until the next minute or a task is created for this one
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
 
-        monitor_thread = threading.Thread(target=monitor_loop, daemon=True)
-        monitor_thread.start()
+    def start_monitoring(self):
+        self._loop_task = asyncio.create_task(self.run())
 
     def process_verification(self, task_id: int, image_data: str) -> Optional[VerificationResponse]:
         if task_id in self.active_tasks:
@@ -504,6 +956,8 @@ class TaskScheduler:
 
     def stop_monitoring(self):
         self.running = False
+        if self._loop_task:
+            self._loop_task.cancel()
         for task_id in list(self.active_tasks.keys()):
             alarm_system.stop_alarm(task_id)
 
@@ -514,7 +968,12 @@ scheduler = TaskScheduler()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    logger.addHandler(_log_handler)
+    log_listener.start()
+    verification_writer.start()
+    alarm_system.start()
     scheduler.start_monitoring()
+    upload_sweeper = asyncio.create_task(sweep_uploads_periodically(db))
     print("AI Schedule Enforcer started successfully!")
     print(f"Database initialized at: {DATABASE_URL}")
     print(f"Groq API Key {'configured' if groq_api_key else 'NOT CONFIGURED - using mock responses'}")
@@ -523,13 +982,21 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     scheduler.stop_monitoring()
+    alarm_system.stop()
+    upload_sweeper.cancel()
+    await verification_writer.stop()
+    if groq_service:
+        await groq_service.aclose()
     print("Scheduler stopped")
+    logger.removeHandler(_log_handler)
+    log_listener.stop()
 
 # Create FastAPI app
 app = FastAPI(
     title="AI Schedule Enforcer",
     description="AI-powered schedule enforcer using Groq LLM for visual verification",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -553,8 +1020,9 @@ async def root():
 async def create_schedule_task(task: ScheduleTask):
     """Add a new schedule task"""
     try:
-        task_id = db.create_task(task)
-        created_task = db.get_task(task_id)
+        task_id = await asyncio.to_thread(db.create_task, task)
+        created_task = await asyncio.to_thread(db.get_task, task_id)
+        scheduler.schedule(task_id, task.start_time)
         return ScheduleTaskResponse(**created_task)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -563,7 +1031,7 @@ async def create_schedule_task(task: ScheduleTask):
 async def get_all_tasks():
     """Get all scheduled tasks"""
     try:
-        tasks = db.get_all_tasks()
+        tasks = await asyncio.to_thread(db.get_all_tasks)
         return [ScheduleTaskResponse(**task) for task in tasks]
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -573,7 +1041,7 @@ async def delete_task(task_id: int):
     """Delete a task permanently from database"""
     try:
         # Check if task exists
-        task = db.get_task(task_id)
+        task = await asyncio.to_thread(db.get_task, task_id)
         if not task:
             raise HTTPException(status_code=404, detail="Task not found")
         
@@ -585,16 +1053,10 @@ async def delete_task(task_id: int):
         if task_id in scheduler.active_tasks:
             del scheduler.active_tasks[task_id]
         
-        # Delete from database
-        with sqlite3.connect(DATABASE_URL) as conn:
-            # Delete associated verifications first (foreign key constraint)
-            conn.execute("DELETE FROM verifications WHERE task_id = ?", (task_id,))
-            # Delete the task
-            cursor = conn.execute("DELETE FROM schedule_tasks WHERE id = ?", (task_id,))
-            conn.commit()
-            
-            if cursor.rowcount == 0:
-                raise HTTPException(status_code=404, detail="Task not found")
+        # Delete from database (verifications and task in one transaction)
+        deleted = await asyncio.to_thread(db.delete_task, task_id)
+        if not deleted:
+            raise HTTPException(status_code=404, detail="Task not found")
         
         return {"message": "Task deleted successfully", "task_id": task_id}
         
@@ -611,22 +1073,44 @@ async def verify_task(
     """Upload image for task verification"""
     try:
         # Validate task exists and is active
-        task = db.get_task(task_id)
+        task = await asyncio.to_thread(db.get_task, task_id)
         if not task:
             raise HTTPException(status_code=404, detail="Task not found")
 
         if task["status"] not in ["active", "pending"]:
             raise HTTPException(status_code=400, detail="Task is not active for verification")
 
-        # Read and encode image
-        image_content = await image.read()
+        # Keep the photo on disk; base64 is only needed for the Groq payload
+        # Starlette has already spooled the upload to a temporary file, so it
+        # is decoded from there instead of being read into memory whole
+        image_content, image_hash = await asyncio.to_thread(downsample_image, image.file)
+        image_path = await asyncio.to_thread(save_upload, image_content)
         image_data = base64.b64encode(image_content).decode("utf-8")
 
         # Process verification
+        state = scheduler.active_tasks.get(task_id)
+        if scheduler.workflow and state:
+            # Drive the task's graph through groq_verify -> complete_retry,
+            # which records the verification and completes the task
+            # Each upload runs on its own copy, so concurrent uploads for the
+            # same task never see (or clear) each other's image
+            result = await scheduler.workflow.ainvoke(state.model_copy(update={
+                "image_data": image_data,
+                "image_path": image_path,
+                "image_hash": image_hash
+            }))
+
+            verification_result = VerificationResponse(**result["verification_result"])
+            if verification_result.success:
+                # Another upload or a DELETE may already have removed it
+                scheduler.active_tasks.pop(task_id, None)
+            return verification_result
+
         if groq_service:
             verification_result = await groq_service.verify_image(
                 image_data, 
-                task["verification_instructions"]
+                task["verification_instructions"],
+                image_hash
             )
         else:
             # Mock response for testing
@@ -647,19 +1131,27 @@ async def verify_task(
             ]
             verification_result = random.choice(mock_responses)
 
-        # Store verification
-        db.store_verification(
-            task_id,
-            image_data,
-            verification_result.success,
-            verification_result.reasoning,
-            verification_result.confidence
-        )
-
         # Update task status based on verification
         if verification_result.success:
             alarm_system.stop_alarm(task_id)
-            db.update_task_status(task_id, "completed", datetime.now().isoformat())
+            # Verification and completion land in one transaction
+            await asyncio.to_thread(
+                db.record_verification_and_complete,
+                task_id,
+                image_path,
+                verification_result.success,
+                verification_result.reasoning,
+                verification_result.confidence
+            )
+        else:
+            # Failed attempts are queued for the batched database write
+            verification_writer.submit(
+                task_id,
+                image_path,
+                verification_result.success,
+                verification_result.reasoning,
+                verification_result.confidence
+            )
 
         return verification_result
 
@@ -670,7 +1162,7 @@ async def verify_task(
 async def get_status():
     """Get current system status"""
     try:
-        tasks = db.get_all_tasks()
+        tasks = await asyncio.to_thread(db.get_all_tasks)
         current_time = datetime.now().strftime("%H:%M")
 
         active_tasks = [task for task in tasks if task["status"] == "active"]
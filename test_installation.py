@@ -7,52 +7,57 @@ This script tests the basic functionality of the application.
 
 import os
 import sys
-import json
-import asyncio
-from datetime import datetime, timedelta
+import functools
+import importlib.util
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import sqlite3
-from pathlib import Path
-import time
+
+_REQUIRED_MODULES = (
+    "fastapi", "pydantic", "uvicorn", "sqlite3", "dotenv",
+    "langchain_core", "langchain_groq", "langgraph",
+)
 
 def test_imports():
-    """Test that all required modules can be imported"""
+    """Test that all required modules are installed"""
     print("🧪 Testing imports...")
 
-    try:
-        # Test core dependencies
-        import fastapi
-        import pydantic
-        import uvicorn
-        import sqlite3
-        from dotenv import load_dotenv
-        print("✅ Core dependencies imported successfully")
-
-        # Test LangChain/LangGraph
-        import langchain_core
-        import langchain_groq  
-        import langgraph
-        print("✅ LangChain/LangGraph dependencies imported successfully")
-
-        return True
-    except ImportError as e:
-        print(f"❌ Import error: {e}")
+    # find_spec only consults the import finders, so no module code is
+    # executed; every missing module is collected for a single report
+    failed = []
+    for name in _REQUIRED_MODULES:
+        try:
+            if importlib.util.find_spec(name) is None:
+                failed.append((name, "not installed"))
+        except (ImportError, ValueError) as e:
+            failed.append((name, str(e)))
+
+    if failed:
+        for name, reason in failed:
+            print(f"❌ Import error: {name} ({reason})")
         print("💡 Try running: pip install -r requirements.txt")
         return False
 
+    print("✅ All dependencies found")
+    return True
+
+@functools.lru_cache(maxsize=1)
+def _env_loaded():
+    """Load .env once per process, returning False if it is missing or empty"""
+    from dotenv import load_dotenv
+    return load_dotenv(dotenv_path=".env", verbose=False)
+
 def test_environment():
     """Test environment configuration"""
     print("\n🧪 Testing environment configuration...")
 
-    env_file = Path(".env")
-    if not env_file.exists():
-        print("❌ .env file not found")
+    # Load environment variables; load_dotenv reports whether it found any
+    if not _env_loaded():
+        print("❌ .env file not found or empty")
         print("💡 Create .env from template: cp .env.template .env")
         return False
 
-    # Load environment variables
-    from dotenv import load_dotenv
-    load_dotenv()
-
     groq_key = os.getenv("GROQ_API_KEY")
     if not groq_key or groq_key == "your_groq_api_key_here":
         print("⚠️  GROQ_API_KEY not configured (will use mock responses)")
@@ -64,18 +69,19 @@ def test_environment():
 
 
 
+_DB_TEST_ROWS = 10_000
+
+def _task_rows(n):
+    """Stream n plain-tuple rows to executemany without building a list"""
+    return (("Task%d" % i, "12:00", 5, 10, "Test instructions") for i in range(n))
+
 def test_database():
     print("\n🧪 Testing database functionality...")
-    test_db = "test_schedule.db"
 
-    # Remove any leftover test DB
-    if os.path.exists(test_db):
-        os.remove(test_db)
-
-    # Step 1: Create and use the DB
-    conn = sqlite3.connect(test_db)
-    cursor = conn.cursor()
-    cursor.execute("""
+    # Step 1: Create and use an in-memory DB (nothing on disk to clean up).
+    # Autocommit mode: transactions are opened explicitly below
+    conn = sqlite3.connect(":memory:", isolation_level=None)
+    conn.executescript("""
         CREATE TABLE IF NOT EXISTS schedule_tasks (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             task_name TEXT NOT NULL,
@@ -86,75 +92,72 @@ def test_database():
             status TEXT DEFAULT 'pending',
             created_at TEXT NOT NULL,
             completed_at TEXT NULL
-        )
+        );
     """)
-    cursor.execute("""
+    # One transaction and one prepared statement for the whole batch;
+    # SQLite stamps created_at itself
+    conn.execute("BEGIN")
+    cursor = conn.executemany("""
         INSERT INTO schedule_tasks
           (task_name, start_time, task_duration, alert_gap,
            verification_instructions, created_at)
-        VALUES (?, ?, ?, ?, ?, ?)
-    """, ("Test Task", "12:00", 5, 10, "Test instructions", datetime.now().isoformat()))
-    conn.commit()
-
-    # Step 2: Verify data
-    cursor.execute("SELECT COUNT(*) FROM schedule_tasks")
-    count = cursor.fetchone()[0]
-    if count == 1:
+        VALUES (?, ?, ?, ?, ?, datetime('now'))
+    """, _task_rows(_DB_TEST_ROWS))
+    inserted = cursor.rowcount  # executemany reports the total across all rows
+    conn.execute("COMMIT")
+
+    # Step 2: Verify data; EXISTS stops at the first row instead of
+    # counting the whole table, the exact count came from the insert
+    stored = conn.execute("SELECT EXISTS(SELECT 1 FROM schedule_tasks)").fetchone()[0]
+    if inserted == _DB_TEST_ROWS and stored == 1:
         print("✅ Database operations working correctly")
         success = True
     else:
         print("❌ Database operations failed")
         success = False
 
-    # Step 3: Close the connection before cleanup
-    cursor.close()
     conn.close()
 
-    # (Optional) give Windows a split second to release file lock
-    time.sleep(0.1)
+    return success
 
-    # Step 4: Delete the test DB
-    try:
-        os.remove(test_db)
-    except PermissionError as e:
-        print(f"❌ Cleanup failed, file still locked: {e}")
-        success = False
 
-    return success
+_VALID_JSON = (
+    b'{"task_name":"Test Task","start_time":"14:30","task_duration":15,"alert_gap":5,'
+    b'"verification_instructions":"Upload a test photo for verification purposes"}'
+)
+
+@functools.lru_cache(maxsize=1)
+def _test_task_model():
+    """Build the test model once; pydantic compiles its validators at class
+    creation. Kept out of module scope so pydantic is only imported when needed"""
+    from pydantic import BaseModel, Field
 
+    class TestTask(BaseModel):
+        task_name: str = Field(..., min_length=1)
+        start_time: str
+        task_duration: int = Field(..., ge=1)
+        alert_gap: int = Field(..., ge=1)
+        verification_instructions: str = Field(..., min_length=10)
+
+    return TestTask
 
 def test_pydantic_models():
     """Test Pydantic model validation"""
     print("\n🧪 Testing Pydantic models...")
 
     try:
-        from pydantic import BaseModel, Field, ValidationError
-
-        # Test valid data
-        valid_task = {
-            "task_name": "Test Task",
-            "start_time": "14:30",
-            "task_duration": 15,
-            "alert_gap": 5,
-            "verification_instructions": "Upload a test photo for verification purposes"
-        }
-
-        # Create a simple test model
-        class TestTask(BaseModel):
-            task_name: str = Field(..., min_length=1)
-            start_time: str
-            task_duration: int = Field(..., ge=1)
-            alert_gap: int = Field(..., ge=1)
-            verification_instructions: str = Field(..., min_length=10)
-
-        task = TestTask(**valid_task)
+        from pydantic import ValidationError
+
+        TestTask = _test_task_model()
+
+        # Test valid data (validated from JSON bytes entirely in pydantic-core)
+        task = TestTask.model_validate_json(_VALID_JSON)
         print("✅ Pydantic model validation working")
 
         # Test invalid data
         try:
-            invalid_task = valid_task.copy()
-            invalid_task["task_duration"] = -1  # Invalid
-            TestTask(**invalid_task)
+            invalid_json = _VALID_JSON.replace(b'"task_duration":15', b'"task_duration":-1')  # Invalid
+            TestTask.model_validate_json(invalid_json)
             print("❌ Pydantic validation not working (should have failed)")
             return False
         except ValidationError:
@@ -171,13 +174,13 @@ def test_time_parsing():
     print("\n🧪 Testing time parsing...")
 
     try:
-        from datetime import datetime
-
-        # Test valid time formats
+        # Test valid time formats (fixed-width HH:MM, sliced rather than strptime'd)
         valid_times = ["00:00", "12:30", "23:59", "06:15"]
         for time_str in valid_times:
-            parsed = datetime.strptime(time_str, "%H:%M")
-            assert parsed is not None
+            assert len(time_str) == 5 and time_str[2] == ":"
+            hour = int(time_str[0:2])
+            minute = int(time_str[3:5])
+            assert 0 <= hour < 24 and 0 <= minute < 60
 
         print("✅ Time parsing working correctly")
         return True
@@ -191,12 +194,11 @@ def test_mock_verification():
     print("\n🧪 Testing mock verification system...")
 
     try:
-        import random
         import base64
 
         # Create mock image data
         test_image = b"fake_image_data_for_testing"
-        image_b64 = base64.b64encode(test_image).decode("utf-8")
+        _ = base64.b64encode(test_image)  # the encoded value is never inspected
 
         # Mock verification responses
         mock_responses = [
@@ -204,10 +206,11 @@ def test_mock_verification():
             {"success": False, "reasoning": "Test verification failed", "confidence": 0.3}
         ]
 
-        response = random.choice(mock_responses)
-        assert "success" in response
-        assert "reasoning" in response
-        assert "confidence" in response
+        # Check both shapes every run rather than a random one
+        for response in mock_responses:
+            assert "success" in response
+            assert "reasoning" in response
+            assert "confidence" in response
 
         print("✅ Mock verification system working")
         return True
@@ -216,29 +219,95 @@ def test_mock_verification():
         print(f"❌ Mock verification error: {e}")
         return False
 
-def run_all_tests():
-    """Run all tests and report results"""
+_TESTS = (
+    ("Module Imports", test_imports),
+    ("Environment Config", test_environment),
+    ("Database Operations", test_database),
+    ("Pydantic Models", test_pydantic_models),
+    ("Time Parsing", test_time_parsing),
+    ("Mock Verification", test_mock_verification),
+)
+
+class _ThreadLocalStdout:
+    """sys.stdout stand-in that sends each worker thread's prints to its own
+    buffer (contextlib.redirect_stdout swaps the global and isn't thread-safe)"""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+
+    def write(self, text):
+        return getattr(self._local, "buffer", self._stream).write(text)
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+    def capture(self, test_func):
+        """Run test_func, returning (passed, captured output, exception or None).
+        Captures nest: an outer capture on the same thread resumes afterwards"""
+        outer = getattr(self._local, "buffer", None)
+        buffer = self._local.buffer = io.StringIO()
+        try:
+            return bool(test_func()), buffer.getvalue(), None
+        except Exception as e:
+            return False, buffer.getvalue(), e
+        finally:
+            if outer is None:
+                del self._local.buffer
+            else:
+                self._local.buffer = outer
+
+def _run_concurrently(tests, capture):
+    """Run tests in worker threads, returning their results in listed order"""
+    with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+        futures = [executor.submit(capture, test_func) for _, test_func in tests]
+        return [future.result() for future in futures]
+
+def run_all_tests(fast=False):
+    """Run all tests and report results; with fast, skip the rest when the
+    module imports fail"""
+    # Every print, from the workers and from the report below, lands in a
+    # buffer; the finished report goes out in a single write
+    stdout = sys.stdout
+    sys.stdout = proxy = _ThreadLocalStdout(stdout)
+    try:
+        _, report, error = proxy.capture(functools.partial(_run_and_report, fast, proxy.capture))
+    finally:
+        sys.stdout = stdout
+
+    stdout.write(report)
+    if error is not None:
+        raise error
+
+def _run_and_report(fast, capture):
+    """Run _TESTS through capture (a _ThreadLocalStdout.capture) and print the report"""
     print("🚀 AI Schedule Enforcer - System Tests")
     print("=" * 50)
 
-    tests = [
-        ("Module Imports", test_imports),
-        ("Environment Config", test_environment),
-        ("Database Operations", test_database), 
-        ("Pydantic Models", test_pydantic_models),
-        ("Time Parsing", test_time_parsing),
-        ("Mock Verification", test_mock_verification)
-    ]
-
     passed = 0
-    total = len(tests)
+    total = len(_TESTS)
+
+    # _TESTS starts with Module Imports; the other tests only need those
+    # modules, not each other, so they run concurrently and print their
+    # output afterwards, in the order they are listed
+    if fast:
+        results = [capture(test_imports)]
+        # Without the modules every other test would fail the same way
+        if results[0][0]:
+            results += _run_concurrently(_TESTS[1:], capture)
+    else:
+        results = _run_concurrently(_TESTS, capture)
+    imports_ok, _, _ = results[0]
 
-    for test_name, test_func in tests:
-        try:
-            if test_func():
-                passed += 1
-        except Exception as e:
-            print(f"❌ {test_name} failed with exception: {e}")
+    for (test_name, _), (ok, output, error) in zip(_TESTS, results):
+        sys.stdout.write(output)
+        if error is not None:
+            print(f"❌ {test_name} failed with exception: {error}")
+        elif ok:
+            passed += 1
+
+    if len(results) < total:
+        print("\n⏹️  --fast: module imports failed, skipping the remaining tests")
 
     print("\n" + "=" * 50)
     print(f"📊 Test Results: {passed}/{total} tests passed")
@@ -251,10 +320,10 @@ def run_all_tests():
         print("3. Open: http://127.0.0.1:8000")
     else:
         print("⚠️  Some tests failed. Please check the errors above.")
-        if passed < total // 2:
+        if not imports_ok:
             print("💡 Try running: pip install -r requirements.txt")
 
     print("=" * 50)
 
 if __name__ == "__main__":
-    run_all_tests()
+    run_all_tests(fast="--fast" in sys.argv[1:])